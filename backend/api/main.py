@@ -1,18 +1,25 @@
 import os
-import json
 import logging
 import asyncio
 import random
-import uuid
-from typing import Optional, List
+import time
+import threading
+from typing import Annotated, Optional, Dict, List, Set, Tuple
 from datetime import datetime
+from contextlib import contextmanager
 
 from fastapi import FastAPI, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PositiveInt, StringConstraints
 import redis
+import redis.asyncio as aioredis
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
+import orjson
+import msgpack
 
 # Configure logging
 logging.basicConfig(
@@ -21,7 +28,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="High-Speed Message Ingestor")
+# orjson-backed responses for every endpoint instead of stdlib json.dumps
+app = FastAPI(title="High-Speed Message Ingestor", default_response_class=ORJSONResponse)
 
 # CORS Middleware - Allow frontend to connect
 app.add_middleware(
@@ -39,23 +47,21 @@ app.add_middleware(
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
-REDIS_LIST_KEY = "pending_messages"
+REDIS_LIST_KEY = "pending_messages"  # MessagePack-encoded payloads
 REDIS_QUEUED_IDS_KEY = "queued_message_ids"  # Track message IDs in queue
 REDIS_BATCH_CHANNEL = "batch_notifications"  # Pub/sub channel for batch events
-
-try:
-    redis_client = redis.Redis(
-        host=REDIS_HOST,
-        port=REDIS_PORT,
-        password=REDIS_PASSWORD,
-        decode_responses=True,
-        socket_connect_timeout=5
-    )
-    redis_client.ping()
-    logger.info(f"Connected to Redis at {REDIS_HOST}:{REDIS_PORT}")
-except Exception as e:
-    logger.error(f"Failed to connect to Redis: {e}")
-    redis_client = None
+REDIS_MESSAGES_CACHE_KEY = "messages:last"  # Hash of serialized GET /messages bodies, one field per limit
+MESSAGES_CACHE_TTL_SECONDS = 2  # Upper bound on staleness; the worker also clears it after each batch
+
+# Async client so Redis round-trips yield to other coroutines instead of
+# blocking the event loop. Connectivity is verified in the startup event.
+redis_client = aioredis.Redis(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    password=REDIS_PASSWORD,
+    decode_responses=True,
+    socket_connect_timeout=5
+)
 
 # PostgreSQL connection
 # In Docker: DB_HOST=postgres (service name), locally: DB_HOST=localhost
@@ -68,35 +74,187 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "ingestor_password")
 # Batch configuration
 BATCH_SIZE = 50  # Messages per batch
 BATCH_TIMEOUT_SECONDS = 2  # Timeout before flushing incomplete batch
+BURST_CHUNK_SIZE = 500  # Messages per Redis pipeline during burst simulations
+BULK_MAX_MESSAGES = 1000  # Messages accepted by one POST /messages/bulk request
+
+
+# Connection pool sizing - reuse warm connections instead of paying the
+# TCP + auth handshake on every request.
+# Note: psycopg2 only keeps `minconn` idle connections, extras are closed on return
+DB_POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN_CONN", 5))
+DB_POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX_CONN", 20))
+
+# Built on first use (and rebuilt after a failed attempt), so an API that starts
+# before PostgreSQL is reachable picks the database up once it comes online
+DB_POOL: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+DB_POOL_RETRY_SECONDS = 2  # Minimum gap between pool build attempts while PostgreSQL is down
+_db_pool_lock = threading.Lock()
+_db_pool_retry_at = 0.0
+
+
+def get_db_pool() -> Optional[psycopg2.pool.ThreadedConnectionPool]:
+    """Return the connection pool, creating it if needed (None if PostgreSQL is unreachable)"""
+    global DB_POOL, _db_pool_retry_at
+    if DB_POOL is not None:
+        return DB_POOL
+
+    with _db_pool_lock:
+        # Another thread may have built it while we waited for the lock; while the
+        # database is down, only retry every DB_POOL_RETRY_SECONDS so requests
+        # fail fast instead of each waiting out connect_timeout
+        if DB_POOL is None and time.monotonic() >= _db_pool_retry_at:
+            try:
+                DB_POOL = psycopg2.pool.ThreadedConnectionPool(
+                    minconn=DB_POOL_MIN_CONN,
+                    maxconn=DB_POOL_MAX_CONN,
+                    host=DB_HOST,
+                    port=DB_PORT,
+                    dbname=DB_NAME,
+                    user=DB_USER,
+                    password=DB_PASSWORD,
+                    connect_timeout=5
+                )
+                logger.info(f"PostgreSQL pool ready ({DB_POOL_MIN_CONN}-{DB_POOL_MAX_CONN} connections)")
+            except Exception as e:
+                logger.error(f"Failed to create PostgreSQL pool: {e}")
+                _db_pool_retry_at = time.monotonic() + DB_POOL_RETRY_SECONDS
+        return DB_POOL
+
 
+@contextmanager
+def get_db_conn():
+    """Borrow a PostgreSQL connection from the pool (yields None if unavailable)"""
+    pool = get_db_pool()
+    if pool is None:
+        yield None
+        return
 
-def get_db_connection():
-    """Create PostgreSQL connection"""
     try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            connect_timeout=5
-        )
-        return conn
+        conn = pool.getconn()
     except Exception as e:
-        logger.error(f"Failed to connect to PostgreSQL: {e}")
-        return None
+        logger.error(f"Failed to get PostgreSQL connection from pool: {e}")
+        yield None
+        return
+
+    try:
+        yield conn
+    finally:
+        # putconn() rolls back any open transaction and drops broken connections
+        pool.putconn(conn)
+
+
+# Blocking database helpers - psycopg2 is synchronous, so async handlers run
+# these via run_db() to keep the event loop free during queries
+
+def fetch_recent_messages(limit: int) -> Optional[List[dict]]:
+    """Fetch the last N persisted messages (None if the database is unavailable)"""
+    with get_db_conn() as conn:
+        if conn is None:
+            return None
+
+        # Rows come back as dicts and the datetimes are left for orjson to
+        # serialize, so no per-row copy or isoformat() calls are needed
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute("""
+                SELECT id, user_id, channel_id, content, created_at, inserted_at
+                FROM messages
+                ORDER BY inserted_at DESC
+                LIMIT %s
+            """, (limit,))
+
+            return cursor.fetchall()
+
+
+def delete_all_messages() -> Optional[int]:
+    """Delete every persisted message, returning the number of rows removed (None if the database is unavailable)"""
+    with get_db_conn() as conn:
+        if conn is None:
+            return None
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM messages")
+                deleted = cursor.rowcount
+            conn.commit()
+            return deleted
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def count_messages() -> int:
+    """Count persisted messages (fallback when Redis metrics are missing)"""
+    with get_db_conn() as conn:
+        if conn is None:
+            return 0
+
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM messages")
+            result = cursor.fetchone()
+            return result[0] if result else 0
+
+
+# Cap in-flight DB calls at the pool size so bursts queue instead of hitting PoolError
+_db_slots = asyncio.Semaphore(DB_POOL_MAX_CONN)
+
+
+async def run_db(func, *args):
+    """Run a blocking database helper in the threadpool"""
+    async with _db_slots:
+        return await run_in_threadpool(func, *args)
+
+
+# Dashboards poll /health and /queue/status from every open tab; responses are
+# cached for a sub-second window so those polls collapse into one Redis read
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 0.25))
+_response_cache: Dict[str, Tuple[float, Optional[dict]]] = {
+    "health": (0.0, None),
+    "queue": (0.0, None),
+}
+_response_cache_locks = {key: asyncio.Lock() for key in _response_cache}
+
+
+async def cached_response(key: str, compute) -> dict:
+    """Return the cached payload for `key`, recomputing it once the TTL expires"""
+    cached_at, payload = _response_cache[key]
+    if payload is not None and time.monotonic() - cached_at < RESPONSE_CACHE_TTL_SECONDS:
+        return payload
+
+    # Only one request recomputes; concurrent callers reuse its result
+    async with _response_cache_locks[key]:
+        cached_at, payload = _response_cache[key]
+        if payload is not None and time.monotonic() - cached_at < RESPONSE_CACHE_TTL_SECONDS:
+            return payload
+
+        payload = await compute()
+        _response_cache[key] = (time.monotonic(), payload)
+        return payload
+
+
+def clear_response_cache():
+    """Drop all cached responses (e.g. after a reset)"""
+    for key in _response_cache:
+        _response_cache[key] = (0.0, None)
+
+
+def new_tracking_id() -> str:
+    """8 hex chars, same shape as str(uuid4())[:8] without building a UUID"""
+    return os.urandom(4).hex()
+
+
+# Stripping and length checks run inside pydantic-core instead of a Python validator;
+# whitespace-only content strips to "" and fails min_length
+MessageContent = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=2000)]
 
 
 class Message(BaseModel):
-    user_id: int = Field(..., gt=0, description="User ID must be a positive integer")
-    channel_id: int = Field(..., gt=0, description="Channel ID must be a positive integer")
-    content: str = Field(..., min_length=1, max_length=2000, description="Message content")
+    user_id: PositiveInt = Field(..., description="User ID must be a positive integer")
+    channel_id: PositiveInt = Field(..., description="Channel ID must be a positive integer")
+    content: MessageContent = Field(..., description="Message content")
 
-    @validator('content')
-    def content_not_empty(cls, v):
-        if not v.strip():
-            raise ValueError('Content cannot be empty or whitespace only')
-        return v.strip()
+
+class BulkMessageRequest(BaseModel):
+    messages: List[Message] = Field(..., min_length=1, max_length=BULK_MAX_MESSAGES)
 
 
 class MessageResponse(BaseModel):
@@ -105,6 +263,12 @@ class MessageResponse(BaseModel):
     queued_at: str
 
 
+class BulkMessageResponse(BaseModel):
+    message_ids: List[str]
+    status: str
+    queued_at: str
+
+
 class MessageFromDB(BaseModel):
     id: int
     user_id: int
@@ -128,24 +292,29 @@ class QueuedMessage(BaseModel):
     status: str = "queued"  # queued, persisted
 
 
+# Static service description - built once at import instead of on every call
+ROOT_INFO = {
+    "service": "High-Speed Message Ingestor",
+    "status": "running",
+    "batch_config": {
+        "batch_size": BATCH_SIZE,
+        "timeout_seconds": BATCH_TIMEOUT_SECONDS
+    },
+    "endpoints": {
+        "POST /messages": "Submit a new message to the queue",
+        "POST /messages/bulk": f"Submit up to {BULK_MAX_MESSAGES} messages to the queue in one request",
+        "POST /simulate": "Run burst simulation with configurable count",
+        "GET /messages": "Get last N messages from database",
+        "GET /health": "Health check endpoint",
+        "GET /queue/status": "Get current queue status and pending messages",
+        "WS /ws/stats": "WebSocket for real-time stats and batch events"
+    }
+}
+
+
 @app.get("/")
 async def root():
-    return {
-        "service": "High-Speed Message Ingestor",
-        "status": "running",
-        "batch_config": {
-            "batch_size": BATCH_SIZE,
-            "timeout_seconds": BATCH_TIMEOUT_SECONDS
-        },
-        "endpoints": {
-            "POST /messages": "Submit a new message to the queue",
-            "POST /simulate": "Run burst simulation with configurable count",
-            "GET /messages": "Get last N messages from database",
-            "GET /health": "Health check endpoint",
-            "GET /queue/status": "Get current queue status and pending messages",
-            "WS /ws/stats": "WebSocket for real-time stats and batch events"
-        }
-    }
+    return ROOT_INFO
 
 
 @app.get("/health")
@@ -157,9 +326,11 @@ async def health_check():
             detail="Redis connection not available"
         )
 
-    try:
-        redis_client.ping()
-        queue_length = redis_client.llen(REDIS_LIST_KEY)
+    async def read_health():
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.ping()
+        pipe.llen(REDIS_LIST_KEY)
+        _, queue_length = await pipe.execute()
         return {
             "status": "healthy",
             "redis": "connected",
@@ -168,6 +339,9 @@ async def health_check():
             "batch_progress": queue_length % BATCH_SIZE,
             "batches_pending": queue_length // BATCH_SIZE
         }
+
+    try:
+        return await cached_response("health", read_health)
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         raise HTTPException(
@@ -186,33 +360,31 @@ async def reset_database():
     deleted_queue = 0
 
     # Clear PostgreSQL
-    conn = get_db_connection()
-    if conn:
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("DELETE FROM messages")
-                deleted_messages = cursor.rowcount
-                conn.commit()
+    try:
+        deleted = await run_db(delete_all_messages)
+        if deleted is None:
+            logger.warning("PostgreSQL unavailable - messages table was not cleared")
+        else:
+            deleted_messages = deleted
             logger.info(f"Deleted {deleted_messages} messages from PostgreSQL")
-        except Exception as e:
-            logger.error(f"Failed to clear PostgreSQL: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
+    except Exception as e:
+        logger.error(f"Failed to clear PostgreSQL: {e}")
 
     # Clear Redis queues
     if redis_client:
         try:
-            deleted_queue = redis_client.llen(REDIS_LIST_KEY)
-            redis_client.delete(REDIS_LIST_KEY)
-            redis_client.delete(REDIS_QUEUED_IDS_KEY)
-            redis_client.delete("persisted_message_ids")
-            redis_client.delete("last_persisted_ids")
-            redis_client.delete("total_messages")
-            redis_client.delete("total_batches")
-            redis_client.delete("current_rps")
-            redis_client.delete("worker_buffer_size")
-            redis_client.delete("batch_start_time")
+            deleted_queue = await redis_client.llen(REDIS_LIST_KEY)
+            await redis_client.delete(REDIS_LIST_KEY)
+            await redis_client.delete(REDIS_QUEUED_IDS_KEY)
+            await redis_client.delete("persisted_message_ids")
+            await redis_client.delete("last_persisted_ids")
+            await redis_client.delete("total_messages")
+            await redis_client.delete("total_batches")
+            await redis_client.delete("current_rps")
+            await redis_client.delete("worker_buffer_size")
+            await redis_client.delete("batch_start_time")
+            await redis_client.delete(REDIS_MESSAGES_CACHE_KEY)
+            clear_response_cache()
             logger.info(f"Cleared Redis queue with {deleted_queue} pending messages")
         except Exception as e:
             logger.error(f"Failed to clear Redis: {e}")
@@ -236,29 +408,30 @@ async def get_queue_status():
             detail="Redis connection not available"
         )
 
-    try:
-        queue_length = redis_client.llen(REDIS_LIST_KEY)
-
-        # Get queued message tracking IDs
-        queued_ids = redis_client.lrange(REDIS_QUEUED_IDS_KEY, 0, -1)
-
+    async def read_queue_status():
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.llen(REDIS_LIST_KEY)
+        # Get the most recent queued message tracking IDs (last 100 for performance)
+        pipe.lrange(REDIS_QUEUED_IDS_KEY, 0, 99)
         # Get last batch completion info
-        last_batch_id = redis_client.get("last_batch_id")
-        last_batch_size = redis_client.get("last_batch_size")
-        last_batch_time = redis_client.get("last_batch_time")
+        pipe.mget("last_batch_id", "last_batch_size", "last_batch_time")
+        queue_length, queued_ids, (last_batch_id, last_batch_size, last_batch_time) = await pipe.execute()
 
         return {
             "queue_length": queue_length,
             "batch_threshold": BATCH_SIZE,
             "batch_progress": queue_length % BATCH_SIZE,
             "batches_ready": queue_length // BATCH_SIZE,
-            "queued_message_ids": queued_ids[:100],  # Limit to last 100 for performance
+            "queued_message_ids": queued_ids,
             "last_batch": {
                 "batch_id": last_batch_id,
                 "size": int(last_batch_size) if last_batch_size else 0,
                 "completed_at": last_batch_time
             }
         }
+
+    try:
+        return await cached_response("queue", read_queue_status)
     except Exception as e:
         logger.error(f"Error getting queue status: {e}")
         raise HTTPException(
@@ -282,7 +455,7 @@ async def create_message(message: Message):
 
     try:
         # Generate unique tracking ID
-        tracking_id = str(uuid.uuid4())[:8]
+        tracking_id = new_tracking_id()
         timestamp = datetime.utcnow().isoformat()
 
         message_payload = {
@@ -293,19 +466,21 @@ async def create_message(message: Message):
             "created_at": timestamp
         }
 
-        # Push to Redis queue
-        redis_client.lpush(REDIS_LIST_KEY, json.dumps(message_payload))
-
+        # Queue the message, track its ID and read the queue depth in one round-trip
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.lpush(REDIS_LIST_KEY, msgpack.packb(message_payload))
         # Track the message ID for lifecycle visualization
-        redis_client.lpush(REDIS_QUEUED_IDS_KEY, tracking_id)
+        pipe.lpush(REDIS_QUEUED_IDS_KEY, tracking_id)
         # Keep only last 1000 tracking IDs
-        redis_client.ltrim(REDIS_QUEUED_IDS_KEY, 0, 999)
-
-        queue_length = redis_client.llen(REDIS_LIST_KEY)
-
-        logger.info(
-            f"Message queued - ID: {tracking_id}, User: {message.user_id}, "
-            f"Queue length: {queue_length}, Batch progress: {queue_length % BATCH_SIZE}/{BATCH_SIZE}"
+        pipe.ltrim(REDIS_QUEUED_IDS_KEY, 0, 999)
+        pipe.llen(REDIS_LIST_KEY)
+        _, _, _, queue_length = await pipe.execute()
+
+        # Per-request log on the hot path: DEBUG with lazy formatting, so nothing
+        # is rendered unless debug logging is enabled
+        logger.debug(
+            "Message queued - ID: %s, User: %s, Queue length: %s, Batch progress: %s/%s",
+            tracking_id, message.user_id, queue_length, queue_length % BATCH_SIZE, BATCH_SIZE
         )
 
         return MessageResponse(
@@ -322,55 +497,117 @@ async def create_message(message: Message):
         )
 
 
-@app.get("/messages", response_model=List[MessageFromDB])
-async def get_messages(limit: int = 50):
+@app.post("/messages/bulk", response_model=BulkMessageResponse, status_code=status.HTTP_201_CREATED)
+async def create_messages_bulk(request: BulkMessageRequest):
     """
-    Retrieve the last N messages from PostgreSQL (persisted messages).
+    Ingest several messages with one request and one Redis round-trip.
+    Same queueing as POST /messages, with a single variadic LPUSH per list.
     """
-    conn = get_db_connection()
-    if conn is None:
+    if redis_client is None:
+        logger.error("Redis client not available")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database connection unavailable"
+            detail="Message queue service unavailable"
         )
 
     try:
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT id, user_id, channel_id, content, created_at, inserted_at
-                FROM messages
-                ORDER BY inserted_at DESC
-                LIMIT %s
-            """, (limit,))
+        timestamp = datetime.utcnow().isoformat()
+        payloads = []
+        tracking_ids = []
 
-            rows = cursor.fetchall()
+        for message in request.messages:
+            tracking_id = new_tracking_id()
+            payloads.append(msgpack.packb({
+                "tracking_id": tracking_id,
+                "user_id": message.user_id,
+                "channel_id": message.channel_id,
+                "content": message.content,
+                "created_at": timestamp
+            }))
+            tracking_ids.append(tracking_id)
 
-            messages = []
-            for row in rows:
-                messages.append({
-                    "id": row[0],
-                    "user_id": row[1],
-                    "channel_id": row[2],
-                    "content": row[3],
-                    "created_at": row[4].isoformat(),
-                    "inserted_at": row[5].isoformat(),
-                })
+        # LPUSH inserts left to right, so the worker still pops the request in order
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.lpush(REDIS_LIST_KEY, *payloads)
+        pipe.lpush(REDIS_QUEUED_IDS_KEY, *tracking_ids)
+        pipe.ltrim(REDIS_QUEUED_IDS_KEY, 0, 999)
+        pipe.llen(REDIS_LIST_KEY)
+        _, _, _, queue_length = await pipe.execute()
+
+        logger.debug(
+            "Bulk queued - %s messages, Queue length: %s",
+            len(tracking_ids), queue_length
+        )
 
-            logger.info(f"Retrieved {len(messages)} persisted messages from database")
-            return messages
+        return BulkMessageResponse(
+            message_ids=tracking_ids,
+            status="queued",
+            queued_at=timestamp
+        )
 
+    except redis.RedisError as e:
+        logger.error(f"Redis error while queuing bulk messages: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue messages"
+        )
+
+
+@app.get("/messages", response_model=List[MessageFromDB])
+async def get_messages(limit: int = 50):
+    """
+    Retrieve the last N messages from PostgreSQL (persisted messages).
+    Serialized results are cached in Redis per limit, so repeated polling is
+    answered with one HGET instead of a database query.
+    """
+    if redis_client is not None:
+        try:
+            cached = await redis_client.hget(REDIS_MESSAGES_CACHE_KEY, limit)
+        except redis.RedisError as e:
+            logger.warning(f"Messages cache read failed: {e}")
+            cached = None
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+    try:
+        messages = await run_db(fetch_recent_messages, limit)
     except Exception as e:
         logger.error(f"Error fetching messages from database: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch messages from database"
         )
-    finally:
-        conn.close()
 
+    if messages is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database connection unavailable"
+        )
+
+    logger.info(f"Retrieved {len(messages)} persisted messages from database")
+    # Returned directly: orjson renders the naive timestamps exactly like
+    # isoformat(), and skipping response_model validation avoids a second pass
+    body = orjson.dumps(messages)
+
+    # A read that started before a worker commit can land here after the worker's
+    # DEL and cache the pre-batch body; that staleness is bounded by
+    # MESSAGES_CACHE_TTL_SECONDS, since the key's TTL is never extended
+    if redis_client is not None:
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hset(REDIS_MESSAGES_CACHE_KEY, limit, body)
+            # NX: the TTL starts with the first cached limit and is not extended,
+            # so no entry outlives MESSAGES_CACHE_TTL_SECONDS
+            pipe.expire(REDIS_MESSAGES_CACHE_KEY, MESSAGES_CACHE_TTL_SECONDS, nx=True)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Messages cache write failed: {e}")
 
-# Realistic chat messages for simulation
-REALISTIC_MESSAGES = [
+    return Response(content=body, media_type="application/json")
+
+
+# Realistic chat messages for simulation (read-only, so a tuple)
+REALISTIC_MESSAGES = (
     "Hey everyone! How's it going?",
     "Just pushed the latest changes to main",
     "Can someone review my PR when they get a chance?",
@@ -406,56 +643,77 @@ REALISTIC_MESSAGES = [
     "The load balancer is configured correctly",
     "Scaling up the worker instances",
     "The queue is draining nicely",
-]
+)
 
 
-def send_burst_messages_sync(count: int) -> List[str]:
+async def send_burst_messages(count: int) -> Tuple[List[str], Optional[int]]:
     """
-    Synchronous function to send burst messages to Redis.
-    Returns list of tracking IDs for the sent messages.
+    Send burst messages to Redis in pipelined chunks.
+    Returns the tracking IDs for the sent messages and the resulting queue
+    length (None if the pipeline failed).
     """
     if redis_client is None:
         logger.error("Redis client not available for simulation")
-        return []
+        return [], None
 
-    logger.info(f"Starting burst simulation: {count} messages")
+    logger.info("Starting burst simulation: %d messages", count)
     tracking_ids = []
 
     try:
-        # Use pipeline for better performance
-        pipe = redis_client.pipeline()
+        # The whole burst is created in the same instant, so stamp it once
+        timestamp = datetime.utcnow().isoformat()
 
-        for i in range(count):
-            tracking_id = str(uuid.uuid4())[:8]
-            timestamp = datetime.utcnow().isoformat()
+        # Draw every random field for the burst up front instead of three
+        # randint/choice calls per message inside the loop
+        contents = random.choices(REALISTIC_MESSAGES, k=count)
+        user_ids = random.choices(range(1, 10001), k=count)
+        channel_ids = random.choices(range(1, 101), k=count)
+
+        # Send the burst in bounded pipeline chunks: client buffers stay small and
+        # the worker can start draining while later chunks are still being sent
+        for start in range(0, count, BURST_CHUNK_SIZE):
+            end = min(start + BURST_CHUNK_SIZE, count)
+            payloads = []
+            chunk_ids = []
+
+            for i in range(start, end):
+                tracking_id = new_tracking_id()
+
+                message_payload = {
+                    "tracking_id": tracking_id,
+                    "user_id": user_ids[i],
+                    "channel_id": channel_ids[i],
+                    "content": contents[i],
+                    "created_at": timestamp
+                }
 
-            # Pick a realistic message randomly
-            content = random.choice(REALISTIC_MESSAGES)
+                payloads.append(msgpack.packb(message_payload))
+                chunk_ids.append(tracking_id)
 
-            message_payload = {
-                "tracking_id": tracking_id,
-                "user_id": random.randint(1, 10000),
-                "channel_id": random.randint(1, 100),
-                "content": content,
-                "created_at": timestamp
-            }
+            # One variadic LPUSH per list instead of one command per message.
+            # LPUSH inserts the values left to right, so the worker's BRPOP still
+            # pops the chunk in creation order (FIFO)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.lpush(REDIS_LIST_KEY, *payloads)
+            pipe.lpush(REDIS_QUEUED_IDS_KEY, *chunk_ids)
 
-            pipe.lpush(REDIS_LIST_KEY, json.dumps(message_payload))
-            pipe.lpush(REDIS_QUEUED_IDS_KEY, tracking_id)
-            tracking_ids.append(tracking_id)
+            if end == count:
+                # Trim tracking IDs list once and read the resulting queue depth
+                pipe.ltrim(REDIS_QUEUED_IDS_KEY, 0, 999)
+                pipe.llen(REDIS_LIST_KEY)
 
-        # Execute all commands at once
-        pipe.execute()
+            results = await pipe.execute()
+            # Only report IDs for chunks Redis actually accepted
+            tracking_ids.extend(chunk_ids)
 
-        # Trim tracking IDs list
-        redis_client.ltrim(REDIS_QUEUED_IDS_KEY, 0, 999)
+        queue_length = results[-1]
 
-        logger.info(f"Burst simulation completed: {count} messages queued")
-        return tracking_ids
+        logger.info("Burst simulation completed: %d messages queued", count)
+        return tracking_ids, queue_length
 
     except Exception as e:
         logger.error(f"Error in burst simulation: {e}")
-        return tracking_ids
+        return tracking_ids, None
 
 
 @app.post("/simulate", status_code=status.HTTP_202_ACCEPTED)
@@ -477,11 +735,12 @@ async def run_simulation(request: SimulationRequest):
 
     count = request.count
 
-    # Send messages synchronously and get the tracking IDs
-    tracking_ids = send_burst_messages_sync(count)
+    # Send messages and get the tracking IDs plus the queue depth after the burst
+    tracking_ids, current_queue = await send_burst_messages(count)
+    if current_queue is None:
+        current_queue = await redis_client.llen(REDIS_LIST_KEY)
 
     # Calculate expected batches
-    current_queue = redis_client.llen(REDIS_LIST_KEY)
     total_after = current_queue
     complete_batches = total_after // BATCH_SIZE
     remaining = total_after % BATCH_SIZE
@@ -498,162 +757,247 @@ async def run_simulation(request: SimulationRequest):
         "message": f"Injecting {count} messages. {complete_batches} batch(es) will flush, {remaining} will remain queued."
     }
 
-@app.websocket("/ws/stats")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    logger.info("WebSocket client connected")
+# Connected dashboard clients. Every client receives the same stats snapshot,
+# so a single background task polls Redis and fans the result out to all of them
+ws_clients: Set[WebSocket] = set()
+STATS_INTERVAL_SECONDS = 0.5  # Faster polling for more responsive updates
+WS_SEND_TIMEOUT_SECONDS = 1.0  # A client slower than this is dropped so it can't stall the fan-out
+background_tasks: List[asyncio.Task] = []
+
+# Safe defaults sent when stats cannot be gathered
+EMPTY_STATS = {
+    "type": "stats_update",
+    "total_messages": 0,
+    "queue_depth": 0,
+    "messages_per_second": 0,
+    "total_batches": 0,
+    "avg_batch_size": 0,
+    "batch_threshold": BATCH_SIZE,
+    "batch_progress": 0,
+    "batch_progress_percent": 0,
+    "batches_ready": 0,
+}
+
+
+async def collect_stats() -> dict:
+    """Build one stats_update snapshot from Redis (falls back to a DB count)"""
+    # Get queue stats and worker metrics from Redis in a single round-trip
+    # queue_depth combines: messages still in Redis queue + messages in worker's buffer
+    redis_queue_depth = 0
+    buffer_size_str = total_messages_str = total_batches_str = current_rps_str = None
+    if redis_client:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.llen(REDIS_LIST_KEY)
+        pipe.mget("worker_buffer_size", "total_messages", "total_batches", "current_rps")
+        redis_queue_depth, (
+            buffer_size_str, total_messages_str, total_batches_str, current_rps_str
+        ) = await pipe.execute()
+    worker_buffer_size = int(buffer_size_str) if buffer_size_str else 0
+
+    # Total queue depth = Redis queue + worker's internal buffer
+    queue_depth = redis_queue_depth + worker_buffer_size
+
+    # Read worker's real-time metrics from Redis (set by the batch processor)
+    total_messages = 0
+    total_batches = 0
+    messages_per_second = 0
+    avg_batch_size = 0.0
+
+    if redis_client:
+        try:
+            # Parse metrics that the worker updates in real-time
+            total_messages = int(total_messages_str) if total_messages_str else 0
+            total_batches = int(total_batches_str) if total_batches_str else 0
+            messages_per_second = int(float(current_rps_str)) if current_rps_str else 0
+
+            # Calculate avg batch size
+            if total_batches > 0:
+                avg_batch_size = total_messages / total_batches
+        except (ValueError, TypeError) as e:
+            logger.debug(f"Error reading Redis metrics: {e}")
+            # Fallback to DB count if Redis metrics not available
+            try:
+                total_messages = await run_db(count_messages)
+            except Exception as db_err:
+                logger.warning(f"DB query error: {db_err}")
 
-    # Track stats for throughput calculation
-    last_total_messages = 0
-    last_check_time = asyncio.get_event_loop().time()
+    batch_progress = queue_depth % BATCH_SIZE
+    batch_progress_percent = (batch_progress / BATCH_SIZE) * 100 if BATCH_SIZE > 0 else 0
 
-    # Create a separate Redis connection for pub/sub
-    pubsub = None
-    pubsub_client = None
-    try:
-        pubsub_client = redis.Redis(
-            host=REDIS_HOST,
-            port=REDIS_PORT,
-            password=REDIS_PASSWORD,
-            decode_responses=True,
-            socket_connect_timeout=5
+    # Build stats payload matching frontend expectations
+    return {
+        "type": "stats_update",
+        "total_messages": total_messages,
+        "queue_depth": queue_depth,
+        "messages_per_second": messages_per_second,
+        "total_batches": total_batches,
+        "avg_batch_size": round(avg_batch_size, 1),
+        "batch_threshold": BATCH_SIZE,
+        "batch_progress": batch_progress,
+        "batch_progress_percent": round(batch_progress_percent, 1),
+        "batches_ready": queue_depth // BATCH_SIZE,
+    }
+
+
+async def broadcast(*payloads: dict):
+    """
+    Send payloads, in order, to every connected client, dropping clients whose
+    send fails or takes longer than WS_SEND_TIMEOUT_SECONDS
+    """
+    # Serialize once for all clients; sent as text frames because the dashboard
+    # JSON.parse()s event.data
+    messages = [orjson.dumps(payload).decode() for payload in payloads]
+
+    async def send_all(ws: WebSocket):
+        for message in messages:
+            await ws.send_text(message)
+
+    clients = list(ws_clients)
+    # Per-client timeout: one stuck socket must not hold up the broadcaster
+    # (and every other client) behind it
+    results = await asyncio.gather(
+        *(asyncio.wait_for(send_all(ws), WS_SEND_TIMEOUT_SECONDS) for ws in clients),
+        return_exceptions=True
+    )
+
+    dropped = [ws for ws, result in zip(clients, results) if isinstance(result, Exception)]
+    if dropped:
+        for ws in dropped:
+            ws_clients.discard(ws)
+        logger.warning("Dropped %d slow or failed WebSocket client(s)", len(dropped))
+        # Close them too (bounded the same way), so their handlers' receive loops end
+        await asyncio.gather(
+            *(asyncio.wait_for(ws.close(), WS_SEND_TIMEOUT_SECONDS) for ws in dropped),
+            return_exceptions=True
         )
-        pubsub = pubsub_client.pubsub()
-        pubsub.subscribe(REDIS_BATCH_CHANNEL)
-        logger.info(f"Subscribed to Redis channel: {REDIS_BATCH_CHANNEL}")
-    except Exception as e:
-        logger.warning(f"Failed to subscribe to Redis channel: {e}")
 
-    try:
-        while True:
+
+async def stats_broadcaster():
+    """Poll Redis once per interval and push the snapshot to all clients"""
+    while True:
+        if ws_clients:
             try:
-                # Check for pub/sub messages (non-blocking)
-                if pubsub:
-                    message = pubsub.get_message(ignore_subscribe_messages=True, timeout=0.1)
-                    if message and message['type'] == 'message':
+                stats_data = await collect_stats()
+            except Exception as e:
+                logger.warning(f"Error gathering stats: {e}")
+                stats_data = EMPTY_STATS
+            await broadcast(stats_data)
+
+        await asyncio.sleep(STATS_INTERVAL_SECONDS)
+
+
+def to_persisted_event(batch_event: dict) -> dict:
+    """Translate a worker 'persisted' event into the frontend batch_persisted shape"""
+    return {
+        "type": "batch_persisted",
+        "ids": batch_event.get('ids', []),
+        "batch_id": batch_event.get('batch_id'),
+        "batch_size": batch_event.get('batch_size', 0),
+        "worker_timestamp": batch_event.get('timestamp'),
+    }
+
+
+async def pubsub_forwarder():
+    """
+    Single process-wide subscriber for batch events.
+    Each event is decoded once and broadcast to every connected client,
+    instead of every client holding its own Redis connection and subscription.
+    """
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(REDIS_BATCH_CHANNEL)
+            logger.info(f"Subscribed to Redis channel: {REDIS_BATCH_CHANNEL}")
+
+            # listen() awaits the socket directly, so events are forwarded the
+            # moment they arrive without a polling timeout
+            async for message in pubsub.listen():
+                # Under burst persistence several events can already be buffered;
+                # drain them all and fan them out together in one pass
+                events = []
+                while message:
+                    if message['type'] == 'message':
                         try:
-                            batch_event = json.loads(message['data'])
-                            # Forward the batch_persisted event immediately
-                            if batch_event.get('type') == 'persisted':
-                                persisted_event = {
-                                    "type": "batch_persisted",
-                                    "ids": batch_event.get('ids', []),
-                                    "batch_id": batch_event.get('batch_id'),
-                                    "batch_size": batch_event.get('batch_size', 0),
-                                    "worker_timestamp": batch_event.get('timestamp'),
-                                }
-                                logger.info(f"🟢 Broadcasting batch_persisted with {len(persisted_event['ids'])} IDs from batch {batch_event.get('batch_id')} at {batch_event.get('timestamp')}")
-                                await websocket.send_json(persisted_event)
-                        except json.JSONDecodeError:
-                            pass
-
-                # Get queue stats from Redis
-                # queue_depth combines: messages still in Redis queue + messages in worker's buffer
-                redis_queue_depth = redis_client.llen(REDIS_LIST_KEY) if redis_client else 0
-                worker_buffer_size = 0
-                if redis_client:
-                    buffer_size_str = redis_client.get("worker_buffer_size")
-                    worker_buffer_size = int(buffer_size_str) if buffer_size_str else 0
-
-                # Total queue depth = Redis queue + worker's internal buffer
-                queue_depth = redis_queue_depth + worker_buffer_size
-
-                # Read worker's real-time metrics from Redis (set by the batch processor)
-                total_messages = 0
-                total_batches = 0
-                messages_per_second = 0
-                avg_batch_size = 0.0
-
-                if redis_client:
-                    try:
-                        # Read metrics that the worker updates in real-time
-                        total_messages_str = redis_client.get("total_messages")
-                        total_batches_str = redis_client.get("total_batches")
-                        current_rps_str = redis_client.get("current_rps")
-
-                        total_messages = int(total_messages_str) if total_messages_str else 0
-                        total_batches = int(total_batches_str) if total_batches_str else 0
-                        messages_per_second = int(float(current_rps_str)) if current_rps_str else 0
-
-                        # Calculate avg batch size
-                        if total_batches > 0:
-                            avg_batch_size = total_messages / total_batches
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Error reading Redis metrics: {e}")
-                        # Fallback to DB count if Redis metrics not available
-                        conn = get_db_connection()
-                        if conn:
-                            try:
-                                with conn.cursor() as cursor:
-                                    cursor.execute("SELECT COUNT(*) FROM messages")
-                                    result = cursor.fetchone()
-                                    total_messages = result[0] if result else 0
-                            except Exception as db_err:
-                                logger.warning(f"DB query error: {db_err}")
-                            finally:
-                                conn.close()
-
-                batch_progress = queue_depth % BATCH_SIZE
-                batch_progress_percent = (batch_progress / BATCH_SIZE) * 100 if BATCH_SIZE > 0 else 0
-
-                # Build stats payload matching frontend expectations
-                stats_data = {
-                    "type": "stats_update",
-                    "total_messages": total_messages,
-                    "queue_depth": queue_depth,
-                    "messages_per_second": messages_per_second,
-                    "total_batches": total_batches,
-                    "avg_batch_size": round(avg_batch_size, 1),
-                    "batch_threshold": BATCH_SIZE,
-                    "batch_progress": batch_progress,
-                    "batch_progress_percent": round(batch_progress_percent, 1),
-                    "batches_ready": queue_depth // BATCH_SIZE,
-                }
+                            batch_event = orjson.loads(message['data'])
+                        except orjson.JSONDecodeError:
+                            batch_event = {}
+                        if batch_event.get('type') == 'persisted':
+                            events.append(to_persisted_event(batch_event))
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0)
+
+                # Forward the batch_persisted events immediately
+                if events and ws_clients:
+                    logger.info(
+                        "🟢 Broadcasting %d batch_persisted event(s) with %d IDs, latest batch %s at %s",
+                        len(events), sum(len(e['ids']) for e in events),
+                        events[-1]['batch_id'], events[-1]['worker_timestamp']
+                    )
+                    await broadcast(*events)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Redis subscription failed, retrying: {e}")
+            await asyncio.sleep(1)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
 
-                await websocket.send_json(stats_data)
 
-            except Exception as e:
-                logger.warning(f"Error gathering stats: {e}")
-                # Send safe defaults on error
-                await websocket.send_json({
-                    "type": "stats_update",
-                    "total_messages": 0,
-                    "queue_depth": 0,
-                    "messages_per_second": 0,
-                    "total_batches": 0,
-                    "avg_batch_size": 0,
-                    "batch_threshold": BATCH_SIZE,
-                    "batch_progress": 0,
-                    "batch_progress_percent": 0,
-                    "batches_ready": 0,
-                })
-
-            await asyncio.sleep(0.5)  # Faster polling for more responsive updates
+@app.websocket("/ws/stats")
+async def websocket_endpoint(websocket: WebSocket):
+    await websocket.accept()
+    ws_clients.add(websocket)
+    logger.info(f"WebSocket client connected ({len(ws_clients)} active)")
+
+    try:
+        # Stats and batch events are pushed by the shared background tasks;
+        # this loop only waits for the client to go away
+        while True:
+            await websocket.receive_text()
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
-        if pubsub:
-            try:
-                pubsub.unsubscribe()
-                pubsub.close()
-            except Exception:
-                pass
-        if pubsub_client:
-            try:
-                pubsub_client.close()
-            except Exception:
-                pass
+        ws_clients.discard(websocket)
         try:
             await websocket.close()
         except Exception:
             pass
-    
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Verify Redis connectivity and start the stats and batch-event broadcasters"""
+    global redis_client
+    try:
+        await redis_client.ping()
+        logger.info(f"Connected to Redis at {REDIS_HOST}:{REDIS_PORT}")
+    except Exception as e:
+        logger.error(f"Failed to connect to Redis: {e}")
+        redis_client = None
+
+    # Warm the PostgreSQL pool; if the database isn't up yet, the first
+    # request after it comes online builds the pool instead
+    await run_in_threadpool(get_db_pool)
+
+    background_tasks.append(asyncio.create_task(stats_broadcaster()))
+    if redis_client:
+        background_tasks.append(asyncio.create_task(pubsub_forwarder()))
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean up Redis connection on shutdown"""
+    """Stop background tasks and clean up Redis connection and PostgreSQL pool on shutdown"""
+    for task in background_tasks:
+        task.cancel()
     if redis_client:
-        redis_client.close()
+        await redis_client.aclose()
         logger.info("Redis connection closed")
+    if DB_POOL:
+        DB_POOL.closeall()
+        logger.info("PostgreSQL pool closed")
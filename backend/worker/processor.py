@@ -1,18 +1,25 @@
 import os
-import json
+import io
+import csv
 import time
+import heapq
 import logging
+import threading
 import uuid
-from typing import List, Dict
+from typing import List, Dict, Deque, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
 import redis
+import msgpack
+import orjson
 import psycopg2
 import psycopg2.extras
 
-# Configure logging
+# Configure logging (LOG_LEVEL=DEBUG brings back the per-drain and per-flush detail)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -21,10 +28,12 @@ logger = logging.getLogger(__name__)
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
-REDIS_LIST_KEY = "pending_messages"
+REDIS_LIST_KEY = "pending_messages"  # MessagePack-encoded payloads
 REDIS_QUEUED_IDS_KEY = "queued_message_ids"
 REDIS_PERSISTED_IDS_KEY = "persisted_message_ids"
+PERSISTED_IDS_TRIM_EVERY = 10  # Flushes between LTRIMs of the persisted IDs list
 REDIS_BATCH_CHANNEL = "batch_notifications"  # Pub/sub channel for batch events
+REDIS_MESSAGES_CACHE_KEY = "messages:last"  # API's cached GET /messages bodies
 
 POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
 POSTGRES_PORT = int(os.getenv("POSTGRES_PORT", 5432))
@@ -34,14 +43,49 @@ POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "ingestor_password")
 
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", 50))
 BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT", 30.0))  # seconds - increased for demo visibility
+# Batches of at least this many messages are written with COPY. Batches never exceed
+# BATCH_SIZE, so this only applies when BATCH_SIZE >= COPY_THRESHOLD (not with the
+# default BATCH_SIZE of 50, where every batch uses the prepared INSERT)
+COPY_THRESHOLD = int(os.getenv("COPY_THRESHOLD", 500))
+METRICS_QUEUE_DEPTH = int(os.getenv("METRICS_QUEUE_DEPTH", 4))  # Pending metric updates before flush_batch waits
+
+# Server-side prepared INSERT: the batch is sent as one array per column and
+# unnested, so a single EXECUTE writes the whole batch with a cached plan
+PREPARE_INSERT_SQL = """
+    PREPARE insert_messages (int[], int[], text[], text[]) AS
+    INSERT INTO messages (user_id, channel_id, content, created_at)
+    SELECT * FROM unnest($1, $2, $3, $4::timestamp[])
+"""
+
+# Remove every ARGV value from the list at KEYS[1] in one server-side call
+LREM_MANY_SCRIPT = """
+for i = 1, #ARGV do
+    redis.call('LREM', KEYS[1], 0, ARGV[i])
+end
+return #ARGV
+"""
+
+
+def decode_message(raw: bytes) -> Dict:
+    """
+    Decode a queued payload.
+    Payloads are MessagePack maps; a leading '{' can only be a JSON payload
+    queued by an older API, so those are still accepted during upgrades.
+    """
+    if raw[:1] == b"{":
+        return orjson.loads(raw)
+    return msgpack.unpackb(raw, raw=False)
 
 
 class BatchProcessor:
     def __init__(self):
         self.redis_client = None
+        self.queue_client = None  # Binary-safe client for MessagePack payloads
+        self.lrem_many_sha = None  # SHA1 of LREM_MANY_SCRIPT, loaded once in connect_redis
         self.pg_conn = None
         self.message_buffer: List[Dict] = []
         self.batch_start_time: float = None  # Time when current batch started (first message arrived)
+        self._flush_deadline: float = None  # time.monotonic() at which the current batch times out
         self.total_processed = 0
         self.total_batches = 0
 
@@ -51,8 +95,14 @@ class BatchProcessor:
         self.rps_window_start = time.time()
 
         # Latency tracking
-        self.latency_samples: List[float] = []  # Recent latency samples
         self.latency_window_size = 100  # Keep last 100 samples
+        self.latency_samples: Deque[float] = deque(maxlen=self.latency_window_size)  # Recent latency samples
+
+        # Redis metric updates run on one background thread (so they stay in
+        # batch order) while the main loop goes back to pulling messages
+        self.metrics_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics")
+        self.metrics_slots = threading.BoundedSemaphore(METRICS_QUEUE_DEPTH)
+        self._flushes_since_trim = 0  # Only touched on the metrics thread
 
     def connect_redis(self):
         """Establish Redis connection"""
@@ -65,6 +115,18 @@ class BatchProcessor:
                 socket_connect_timeout=5
             )
             self.redis_client.ping()
+            # Loaded up front so flushes can queue a plain EVALSHA; a registered
+            # Script object would add a SCRIPT EXISTS round-trip to every pipeline
+            self.lrem_many_sha = self.redis_client.script_load(LREM_MANY_SCRIPT)
+
+            # Queue payloads are raw bytes, so they are popped without UTF-8 decoding
+            self.queue_client = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                password=REDIS_PASSWORD,
+                decode_responses=False,
+                socket_connect_timeout=5
+            )
             logger.info(f"Connected to Redis at {REDIS_HOST}:{REDIS_PORT}")
 
             # Initialize Redis metrics if they don't exist
@@ -95,6 +157,13 @@ class BatchProcessor:
                 password=POSTGRES_PASSWORD,
                 connect_timeout=5
             )
+            # Every flush is a single statement (one EXECUTE or one COPY), which is
+            # atomic on its own. Autocommit drops the separate BEGIN and COMMIT
+            # round-trips psycopg2 would otherwise send around it
+            self.pg_conn.autocommit = True
+            # Prepared statements live for the session, so prepare once per connection
+            with self.pg_conn.cursor() as cursor:
+                cursor.execute(PREPARE_INSERT_SQL)
             logger.info(f"Connected to PostgreSQL at {POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}")
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
@@ -107,58 +176,89 @@ class BatchProcessor:
         - We have BATCH_SIZE messages, OR
         - BATCH_TIMEOUT seconds have passed since the FIRST message of this batch arrived
         """
+        n = len(self.message_buffer)
+        if n == 0:
+            return False
+
         # Flush if we've reached the batch size threshold
-        if len(self.message_buffer) >= BATCH_SIZE:
-            logger.info(f"🔔 Flush triggered: batch size reached ({len(self.message_buffer)}/{BATCH_SIZE})")
+        if n >= BATCH_SIZE:
+            logger.debug("🔔 Flush triggered: batch size reached (%d/%d)", n, BATCH_SIZE)
             return True
 
-        # Flush if timeout has passed since the batch started (first message arrived)
-        if len(self.message_buffer) > 0 and self.batch_start_time is not None:
-            time_since_batch_start = time.time() - self.batch_start_time
-            if time_since_batch_start >= BATCH_TIMEOUT:
-                logger.info(f"🔔 Flush triggered: timeout reached ({time_since_batch_start:.1f}s >= {BATCH_TIMEOUT}s)")
-                logger.info(f"   BATCH_TIMEOUT={BATCH_TIMEOUT}, batch_start_time={self.batch_start_time}, now={time.time()}")
-                return True
-            else:
-                # Debug: show why we're NOT flushing yet
-                logger.debug(f"⏳ Not flushing yet: {time_since_batch_start:.1f}s < {BATCH_TIMEOUT}s timeout")
+        # Flush if timeout has passed since the batch started (first message arrived).
+        # The deadline is fixed when the batch starts, so this is one clock read
+        if time.monotonic() >= self._flush_deadline:
+            logger.debug("🔔 Flush triggered: timeout reached (%ss)", BATCH_TIMEOUT)
+            return True
 
         return False
 
-    def calculate_message_latencies(self, batch_data: List[tuple]) -> List[float]:
+    def created_timestamp(self, created_at_str: str) -> Optional[float]:
         """
-        Calculate latency for each message in the batch.
-        Latency = time from message creation to DB commit.
+        Parse a message's ISO created_at into epoch seconds.
+        Done once when the message is buffered so flushes only subtract.
+        """
+        try:
+            created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
+            return created_at.timestamp()
+        except Exception as e:
+            logger.warning(f"Failed to parse timestamp {created_at_str}: {e}")
+            return None
 
-        Args:
-            batch_data: List of tuples containing message data
+    def calculate_message_latencies(self) -> List[float]:
+        """
+        Calculate latency for each message in the buffer.
+        Latency = time from message creation to DB commit.
 
         Returns:
             List of latency values in milliseconds
         """
-        latencies = []
         current_time = time.time()
+        return [
+            (current_time - msg['_created_ts']) * 1000
+            for msg in self.message_buffer
+            if msg['_created_ts'] is not None
+        ]
 
-        for msg_data in batch_data:
-            # msg_data[3] is created_at timestamp (ISO format string)
-            created_at_str = msg_data[3]
-            try:
-                # Parse ISO timestamp
-                created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                created_timestamp = created_at.timestamp()
-
-                # Calculate latency in milliseconds
-                latency_ms = (current_time - created_timestamp) * 1000
-                latencies.append(latency_ms)
-            except Exception as e:
-                logger.warning(f"Failed to parse timestamp {created_at_str}: {e}")
-                continue
+    def latency_percentiles(self) -> Tuple[float, float]:
+        """
+        P95 and P99 over the latency window.
+        Both sit in the top 5% of samples, so only that slice is selected
+        (heapq.nlargest) instead of sorting the whole window every batch.
+        """
+        n = len(self.latency_samples)
+        if n == 0:
+            return 0.0, 0.0
 
-        return latencies
+        p95_index = int(n * 0.95)
+        p99_index = int(n * 0.99)
+        # top[j] is the value at ascending sorted index n - 1 - j
+        top = heapq.nlargest(n - p95_index, self.latency_samples)
+        return top[n - 1 - p95_index], top[n - 1 - p99_index]
 
-    def update_redis_metrics(self, batch_size: int, latencies: List[float], batch_duration: float, persisted_ids: List[str]):
+    def submit_redis_metrics(self, *args):
+        """
+        Queue update_redis_metrics on the metrics thread.
+        Blocks once METRICS_QUEUE_DEPTH updates are pending, so a slow Redis
+        applies backpressure instead of letting the backlog grow unbounded.
+        """
+        self.metrics_slots.acquire()
+        future = self.metrics_executor.submit(self.update_redis_metrics, *args)
+        future.add_done_callback(self._metrics_done)
+
+    def _metrics_done(self, future: Future):
+        """Free the metrics slot and surface anything update_redis_metrics didn't handle"""
+        self.metrics_slots.release()
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Metrics update failed: {error}")
+
+    def update_redis_metrics(self, batch_size: int, latencies: List[float], batch_duration: float,
+                             persisted_ids: List[str], total_processed: int, total_batches: int):
         """
         Update Redis metrics for dashboard real-time updates.
+        Runs on the metrics thread; totals are passed in as of the flush that
+        produced them instead of being read from self.
 
         Updates:
         - total_messages: Increments by batch_size (only after PostgreSQL commit)
@@ -175,33 +275,37 @@ class BatchProcessor:
             batch_id = str(uuid.uuid4())[:8]
             batch_time = datetime.utcnow().isoformat()
 
+            # Every metric update below is queued on one pipeline and sent in a
+            # single round-trip at the end
+            pipe = self.redis_client.pipeline(transaction=False)
+
             # Increment total messages counter (only for successfully persisted messages)
-            self.redis_client.incrby("total_messages", batch_size)
+            pipe.incrby("total_messages", batch_size)
 
             # Increment total batches counter (only after successful flush)
-            self.redis_client.incr("total_batches")
+            pipe.incr("total_batches")
 
             # Store batch completion info for WebSocket broadcast
-            self.redis_client.set("last_batch_id", batch_id)
-            self.redis_client.set("last_batch_size", batch_size)
-            self.redis_client.set("last_batch_time", batch_time)
+            pipe.set("last_batch_id", batch_id)
+            pipe.set("last_batch_size", batch_size)
+            pipe.set("last_batch_time", batch_time)
 
             # Store persisted message IDs for frontend status updates
             if persisted_ids:
-                pipe = self.redis_client.pipeline()
-                for tracking_id in persisted_ids:
-                    pipe.lpush(REDIS_PERSISTED_IDS_KEY, tracking_id)
-                pipe.execute()
-                # Keep only last 200 persisted IDs
-                self.redis_client.ltrim(REDIS_PERSISTED_IDS_KEY, 0, 199)
+                # One variadic LPUSH for the whole batch
+                pipe.lpush(REDIS_PERSISTED_IDS_KEY, *persisted_ids)
+                # Also remove from queued IDs list (one script call instead of one LREM per ID)
+                pipe.evalsha(self.lrem_many_sha, 1, REDIS_QUEUED_IDS_KEY, *persisted_ids)
+                # Keep only last 200 persisted IDs. Trimming every few flushes is
+                # enough: the list only grows by one batch per flush in between
+                self._flushes_since_trim += 1
+                if self._flushes_since_trim >= PERSISTED_IDS_TRIM_EVERY:
+                    pipe.ltrim(REDIS_PERSISTED_IDS_KEY, 0, 199)
+                    self._flushes_since_trim = 0
 
                 # Store last batch's persisted IDs for WebSocket to broadcast
                 # This key is read and cleared by the WebSocket handler
-                self.redis_client.set("last_persisted_ids", json.dumps(persisted_ids))
-
-                # Also remove from queued IDs list
-                for tracking_id in persisted_ids:
-                    self.redis_client.lrem(REDIS_QUEUED_IDS_KEY, 0, tracking_id)
+                pipe.set("last_persisted_ids", orjson.dumps(persisted_ids))
 
             # Update RPS tracking with improved sliding window
             current_time = time.time()
@@ -221,28 +325,25 @@ class BatchProcessor:
                 current_rps = self.rps_message_count / max(time_since_window_start, 0.1)
 
             # Update Redis with current RPS
-            self.redis_client.set("current_rps", f"{current_rps:.2f}")
+            pipe.set("current_rps", f"{current_rps:.2f}")
 
             # Update latency metrics
             if latencies:
                 # Add to samples (keep last 100)
                 self.latency_samples.extend(latencies)
-                self.latency_samples = self.latency_samples[-self.latency_window_size:]
 
                 # Calculate statistics
                 avg_latency = sum(latencies) / len(latencies)
-                sorted_latencies = sorted(self.latency_samples)
-                p95_latency = sorted_latencies[int(len(sorted_latencies) * 0.95)] if sorted_latencies else 0
-                p99_latency = sorted_latencies[int(len(sorted_latencies) * 0.99)] if sorted_latencies else 0
+                p95_latency, p99_latency = self.latency_percentiles()
 
                 # Store in Redis
-                self.redis_client.set("avg_latency_ms", f"{avg_latency:.2f}")
-                self.redis_client.set("p95_latency_ms", f"{p95_latency:.2f}")
-                self.redis_client.set("p99_latency_ms", f"{p99_latency:.2f}")
+                pipe.set("avg_latency_ms", f"{avg_latency:.2f}")
+                pipe.set("p95_latency_ms", f"{p95_latency:.2f}")
+                pipe.set("p99_latency_ms", f"{p99_latency:.2f}")
 
                 logger.debug(
-                    f"Latency metrics - Avg: {avg_latency:.2f}ms, "
-                    f"P95: {p95_latency:.2f}ms, P99: {p99_latency:.2f}ms"
+                    "Latency metrics - Avg: %.2fms, P95: %.2fms, P99: %.2fms",
+                    avg_latency, p95_latency, p99_latency
                 )
 
             # CRITICAL: Publish batch completion event via Redis pub/sub
@@ -252,25 +353,61 @@ class BatchProcessor:
                 "batch_id": batch_id,
                 "batch_size": batch_size,
                 "ids": persisted_ids,  # List of message IDs that were persisted
-                "total_batches": self.total_batches,
-                "total_messages": self.total_processed,
+                "total_batches": total_batches,
+                "total_messages": total_processed,
                 "timestamp": batch_time
             }
-            self.redis_client.publish(REDIS_BATCH_CHANNEL, json.dumps(batch_event))
-            logger.info(f"📡 Published persisted event to channel '{REDIS_BATCH_CHANNEL}' with {len(persisted_ids)} IDs")
+            # New rows are visible, so drop the API's cached "last N messages".
+            # Queued before the PUBLISH: Redis runs pipelined commands in order, so
+            # a client reacting to the event never reads the pre-batch body
+            pipe.delete(REDIS_MESSAGES_CACHE_KEY)
+            pipe.publish(REDIS_BATCH_CHANNEL, orjson.dumps(batch_event))
 
-            logger.info(
-                f"📊 Redis metrics updated - Total: {self.total_processed}, "
-                f"Batches: {self.total_batches}, RPS: {current_rps:.2f}, "
-                f"Batch ID: {batch_id}"
+            # Everything above is sent to Redis in one round-trip
+            try:
+                pipe.execute()
+            except redis.exceptions.NoScriptError:
+                # Redis lost its script cache (restart or SCRIPT FLUSH). The pipeline is
+                # not transactional, so every other command already ran: reload the
+                # script and redo only the queued-ID removal
+                self.lrem_many_sha = self.redis_client.script_load(LREM_MANY_SCRIPT)
+                self.redis_client.evalsha(self.lrem_many_sha, 1, REDIS_QUEUED_IDS_KEY, *persisted_ids)
+            # Per-batch detail is DEBUG; the flush summary in flush_batch stays at INFO
+            logger.debug(
+                "📡 Published persisted event to channel '%s' with %d IDs",
+                REDIS_BATCH_CHANNEL, len(persisted_ids)
+            )
+            logger.debug(
+                "📊 Redis metrics updated - Total: %d, Batches: %d, RPS: %.2f, Batch ID: %s",
+                total_processed, total_batches, current_rps, batch_id
             )
 
         except redis.RedisError as e:
             logger.error(f"Failed to update Redis metrics: {e}")
 
+    def insert_batch(self, cursor, batch_data: List[tuple]):
+        """Insert the batch with ONE EXECUTE of the prepared insert_messages statement"""
+        # Transpose rows into per-column lists; psycopg2 adapts lists to ARRAY[...]
+        user_ids, channel_ids, contents, created_ats = (list(column) for column in zip(*batch_data))
+        cursor.execute(
+            "EXECUTE insert_messages (%s, %s, %s, %s)",
+            (user_ids, channel_ids, contents, created_ats)
+        )
+
+    def copy_batch(self, cursor, batch_data: List[tuple]):
+        """Stream the batch into PostgreSQL with COPY ... FROM STDIN as CSV"""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(batch_data)
+        buffer.seek(0)
+        cursor.copy_expert(
+            "COPY messages (user_id, channel_id, content, created_at) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
     def flush_batch(self):
         """
-        Bulk insert messages into PostgreSQL using executemany.
+        Bulk insert messages into PostgreSQL using a single prepared INSERT
+        (or COPY for batches of COPY_THRESHOLD messages and more).
         This is where the magic happens - batching for high throughput!
 
         IMPORTANT: Metrics are only updated AFTER successful PostgreSQL commit.
@@ -282,67 +419,89 @@ class BatchProcessor:
         batch_size = len(self.message_buffer)
         start_time = time.time()
 
-        # Collect tracking IDs for status updates
-        persisted_ids = [msg.get('tracking_id', '') for msg in self.message_buffer if msg.get('tracking_id')]
-
         try:
+            # Prepare batch data and collect tracking IDs for status updates
+            # in one pass over the buffer (appends bound to locals)
+            batch_data = []
+            persisted_ids = []
+            add_row = batch_data.append
+            add_id = persisted_ids.append
+            for msg in self.message_buffer:
+                add_row((msg['user_id'], msg['channel_id'], msg['content'], msg['created_at']))
+                tracking_id = msg.get('tracking_id')
+                if tracking_id:
+                    add_id(tracking_id)
+
             with self.pg_conn.cursor() as cursor:
-                # Prepare the INSERT statement
-                insert_query = """
-                    INSERT INTO messages (user_id, channel_id, content, created_at)
-                    VALUES (%s, %s, %s, %s)
-                """
-
-                # Prepare batch data
-                batch_data = [
-                    (
-                        msg['user_id'],
-                        msg['channel_id'],
-                        msg['content'],
-                        msg['created_at']
-                    )
-                    for msg in self.message_buffer
-                ]
-
-                # Execute batch insert
-                cursor.executemany(insert_query, batch_data)
-                self.pg_conn.commit()
+                # Large batches (BATCH_SIZE tuned up to COPY_THRESHOLD or more) go
+                # through COPY, which skips statement parsing; others use the prepared INSERT
+                if batch_size >= COPY_THRESHOLD:
+                    self.copy_batch(cursor, batch_data)
+                else:
+                    self.insert_batch(cursor, batch_data)
+                # Autocommit: the batch is committed once the statement returns
 
                 # Calculate latencies for this batch
-                latencies = self.calculate_message_latencies(batch_data)
+                latencies = self.calculate_message_latencies()
 
                 # Update statistics ONLY AFTER successful commit
                 self.total_processed += batch_size
                 self.total_batches += 1
                 elapsed_time = time.time() - start_time
 
-                # Update Redis metrics for real-time dashboard
+                # Update Redis metrics for real-time dashboard without waiting on Redis
                 # Pass persisted_ids so frontend can update message statuses
-                self.update_redis_metrics(batch_size, latencies, elapsed_time, persisted_ids)
+                self.submit_redis_metrics(
+                    batch_size, latencies, elapsed_time, persisted_ids,
+                    self.total_processed, self.total_batches
+                )
 
+                # The one INFO line per flush
                 logger.info(
-                    f"✓ Batch #{self.total_batches} saved successfully: "
-                    f"{batch_size} messages in {elapsed_time:.3f}s "
-                    f"({batch_size / elapsed_time:.0f} msg/s) | "
-                    f"Total processed: {self.total_processed}"
+                    "✓ Batch #%d saved successfully: %d messages in %.3fs (%.0f msg/s) | Total processed: %d",
+                    self.total_batches, batch_size, elapsed_time,
+                    batch_size / elapsed_time, self.total_processed
                 )
 
                 # Clear the buffer and reset batch timer
                 self.message_buffer.clear()
                 self.batch_start_time = None  # Reset - no active batch
+                self._flush_deadline = None
 
-                # Reset buffer size in Redis
-                self.redis_client.set("worker_buffer_size", 0)
-                self.redis_client.delete("batch_start_time")
+                # Reset buffer size in Redis (one round-trip for both keys)
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.set("worker_buffer_size", 0)
+                pipe.delete("batch_start_time")
+                pipe.execute()
 
-                logger.info("✅ Batch complete - timer reset, ready for next batch")
+                logger.debug("✅ Batch complete - timer reset, ready for next batch")
 
         except Exception as e:
             logger.error(f"Failed to flush batch: {e}")
-            self.pg_conn.rollback()
+            # Nothing to roll back: a failed statement commits none of its rows
             # Re-raise to handle in main loop
             raise
 
+    def pop_messages(self) -> List[bytes]:
+        """
+        Pop up to the space left in the current batch in one round-trip.
+
+        LMPOP drains many messages per call (RIGHT end = FIFO with LPUSH).
+        When the queue is empty, fall back to a BRPOP with a 1 second timeout
+        so the loop sleeps until work arrives instead of busy-waiting.
+        """
+        count = max(BATCH_SIZE - len(self.message_buffer), 1)
+        result = self.queue_client.lmpop(1, REDIS_LIST_KEY, direction="RIGHT", count=count)
+        if result:
+            # result is [key, [values...]] in pop order
+            return result[1]
+
+        result = self.queue_client.brpop(REDIS_LIST_KEY, timeout=1)
+        if result:
+            # result is a tuple: (key, value)
+            return [result[1]]
+        return []
+
     def process_messages(self):
         """
         Main processing loop:
@@ -357,44 +516,58 @@ class BatchProcessor:
 
         while True:
             try:
-                # Non-blocking pop from Redis (RPOP for FIFO with LPUSH)
-                # Using BRPOP with 1 second timeout to avoid busy-waiting
-                result = self.redis_client.brpop(REDIS_LIST_KEY, timeout=1)
+                raw_messages = self.pop_messages()
 
-                if result:
-                    # result is a tuple: (key, value)
-                    _, message_json = result
-                    message = json.loads(message_json)
+                if raw_messages:
+                    batch_was_empty = len(self.message_buffer) == 0
 
-                    # Start the batch timer when the FIRST message arrives
-                    # This ensures the 30s timeout starts from when messages arrive,
-                    # not from some arbitrary point in time
-                    if len(self.message_buffer) == 0:
-                        self.batch_start_time = time.time()
-                        logger.info(f"⏱️ New batch started - 30s timeout begins NOW")
+                    for raw_message in raw_messages:
+                        try:
+                            message = decode_message(raw_message)
+                        except (ValueError, msgpack.UnpackException) as e:
+                            # orjson.JSONDecodeError and msgpack's ExtraData/FormatError are ValueErrors
+                            logger.error(f"Invalid message payload: {e}")
+                            continue
 
-                    self.message_buffer.append(message)
+                        # A payload can decode cleanly to a non-map (e.g. a bare msgpack
+                        # int or list); skip it here, since the rest of this chunk is
+                        # already popped from Redis and must still be buffered
+                        if not isinstance(message, dict):
+                            logger.error(f"Invalid message payload: expected a map, got {type(message).__name__}")
+                            continue
 
-                    # Update Redis with current buffer size so frontend can display it
-                    self.redis_client.set("worker_buffer_size", len(self.message_buffer))
-                    self.redis_client.set("batch_start_time", self.batch_start_time)
+                        message['_created_ts'] = self.created_timestamp(message.get('created_at', ''))
+                        self.message_buffer.append(message)
 
-                    # Calculate and show remaining time until timeout
-                    elapsed = time.time() - self.batch_start_time
-                    remaining = max(0, BATCH_TIMEOUT - elapsed)
-                    logger.info(
-                        f"📥 Message buffered - Buffer: {len(self.message_buffer)}/{BATCH_SIZE} | "
-                        f"Timeout in {remaining:.1f}s"
-                    )
+                    # Start the batch timer when the FIRST message arrives
+                    # This ensures the 30s timeout starts from when messages arrive,
+                    # not from some arbitrary point in time
+                    if batch_was_empty and self.message_buffer:
+                        self.batch_start_time = time.time()  # Wall clock, shown by the dashboard
+                        self._flush_deadline = time.monotonic() + BATCH_TIMEOUT
+                        logger.debug("⏱️ New batch started - %ss timeout begins NOW", BATCH_TIMEOUT)
+
+                    if self.message_buffer:
+                        # Update Redis with current buffer size so frontend can display it
+                        # (once per drained chunk rather than once per message)
+                        self.redis_client.mset({
+                            "worker_buffer_size": len(self.message_buffer),
+                            "batch_start_time": self.batch_start_time,
+                        })
+
+                        # Runs once per drain at full ingest rate: DEBUG only, and the
+                        # remaining time is only computed when it will be logged
+                        if logger.isEnabledFor(logging.DEBUG):
+                            remaining = max(0, self._flush_deadline - time.monotonic())
+                            logger.debug(
+                                "📥 %d message(s) buffered - Buffer: %d/%d | Timeout in %.1fs",
+                                len(raw_messages), len(self.message_buffer), BATCH_SIZE, remaining
+                            )
 
                 # Check if we should flush the batch
                 if self.should_flush():
                     self.flush_batch()
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in message: {e}")
-                continue
-
             except KeyboardInterrupt:
                 logger.info("Received shutdown signal")
                 # Flush remaining messages before shutting down
@@ -417,10 +590,13 @@ class BatchProcessor:
             logger.error(f"Fatal error: {e}")
             raise
         finally:
-            # Cleanup
+            # Cleanup - let queued metric updates reach Redis before closing it
+            self.metrics_executor.shutdown(wait=True)
             if self.redis_client:
                 self.redis_client.close()
                 logger.info("Redis connection closed")
+            if self.queue_client:
+                self.queue_client.close()
             if self.pg_conn:
                 self.pg_conn.close()
                 logger.info("PostgreSQL connection closed")
@@ -15,6 +15,9 @@ CREATE INDEX IF NOT EXISTS idx_messages_user_id ON messages(user_id);
 CREATE INDEX IF NOT EXISTS idx_messages_channel_id ON messages(channel_id);
 CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages(created_at);
 CREATE INDEX IF NOT EXISTS idx_messages_channel_user ON messages(channel_id, user_id);
+-- "Last N messages" (ORDER BY inserted_at DESC LIMIT N) reads the first N index
+-- entries instead of sorting the table
+CREATE INDEX IF NOT EXISTS idx_messages_inserted_at_desc ON messages(inserted_at DESC);
 
 -- Log the table creation
 DO $$
@@ -0,0 +1,13 @@
+-- Add the inserted_at index to databases created before it was in init.sql
+-- Run outside a transaction (CONCURRENTLY does not block ingestion):
+--   docker exec -i message-db psql -U ingestor -d messages_db < infrastructure/migrations/001_messages_inserted_at_desc_idx.sql
+--
+-- content is not INCLUDEd: a 2000-character message can exceed the btree entry
+-- size limit, and the heap fetch for N rows is cheap next to a full sort
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_messages_inserted_at_desc ON messages(inserted_at DESC);
+
+-- Expect "Index Scan using idx_messages_inserted_at_desc" with no Sort node:
+-- EXPLAIN (ANALYZE, BUFFERS)
+-- SELECT id, user_id, channel_id, content, created_at, inserted_at
+-- FROM messages ORDER BY inserted_at DESC LIMIT 5;
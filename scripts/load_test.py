@@ -8,10 +8,12 @@ the ingestion pipeline and verify real-time dashboard metrics.
 Usage:
     python scripts/load_test.py --messages 10000 --concurrent 100
     python scripts/load_test.py --quick  # Run quick test (1000 messages, 50 concurrent)
+    python scripts/load_test.py --stress --batch-per-request 50  # 50 messages per POST /messages/bulk
 """
 
 import asyncio
 import httpx
+import orjson
 import time
 import random
 import string
@@ -21,16 +23,35 @@ import argparse
 import sys
 
 
+CONTENT_TEMPLATES = (
+    "Load test message: {}",
+    "Testing throughput with ID: {}",
+    "High-speed ingestor test: {}",
+    "Stress testing message pipeline: {}",
+    "Verifying batch processing: {}",
+    "Random test data point: {}",
+    "Performance validation message: {}",
+    "Concurrent request test: {}",
+)
+SUFFIX_ALPHABET = string.ascii_letters + string.digits
+SUFFIX_LENGTH = 8
+JSON_HEADERS = {"content-type": "application/json"}  # Shared by every request
+PROGRESS_INTERVAL_SECONDS = 0.1  # Progress bar refresh rate (10 Hz)
+MAX_BULK_MESSAGES = 1000  # Must match BULK_MAX_MESSAGES (BulkMessageRequest) in backend/api/main.py
+
+
 class LoadTester:
     def __init__(
         self,
         api_url: str = "http://localhost:8000",
         total_messages: int = 1000,
         concurrent_requests: int = 50,
+        batch_per_request: int = 1,
     ):
         self.api_url = api_url
         self.total_messages = total_messages
         self.concurrent_requests = concurrent_requests
+        self.batch_per_request = batch_per_request
 
         # Metrics
         self.successful_requests = 0
@@ -39,47 +60,45 @@ class LoadTester:
         self.end_time = None
         self.errors: List[str] = []
 
-    def generate_random_user_id(self) -> int:
-        """Generate random user ID between 1 and 10000"""
-        return random.randint(1, 10000)
-
-    def generate_random_channel_id(self) -> int:
-        """Generate random channel ID between 1 and 100"""
-        return random.randint(1, 100)
-
-    def generate_random_content(self) -> str:
-        """Generate random message content"""
-        templates = [
-            "Load test message: {}",
-            "Testing throughput with ID: {}",
-            "High-speed ingestor test: {}",
-            "Stress testing message pipeline: {}",
-            "Verifying batch processing: {}",
-            "Random test data point: {}",
-            "Performance validation message: {}",
-            "Concurrent request test: {}",
-        ]
-
-        template = random.choice(templates)
-        random_suffix = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-        return template.format(random_suffix)
+    def create_client(self) -> httpx.AsyncClient:
+        """
+        One client for the whole run, with a pool sized to the concurrency
+        (httpx defaults to 100 connections, which would cap in-flight requests)
+        """
+        limits = httpx.Limits(
+            max_connections=self.concurrent_requests,
+            max_keepalive_connections=self.concurrent_requests,
+        )
+        return httpx.AsyncClient(http2=True, limits=limits, timeout=httpx.Timeout(10.0))
 
-    def generate_message(self) -> Dict:
-        """Generate a single random message"""
-        return {
-            "user_id": self.generate_random_user_id(),
-            "channel_id": self.generate_random_channel_id(),
-            "content": self.generate_random_content(),
-        }
+    def generate_messages(self, count: int) -> List[Dict]:
+        """
+        Generate `count` random messages.
+        Each field is drawn for the whole run with one random.choices call
+        instead of five random calls per message.
+        """
+        user_ids = random.choices(range(1, 10001), k=count)
+        channel_ids = random.choices(range(1, 101), k=count)
+        templates = random.choices(CONTENT_TEMPLATES, k=count)
+        # One string holding every suffix, sliced per message
+        suffixes = ''.join(random.choices(SUFFIX_ALPHABET, k=SUFFIX_LENGTH * count))
+
+        return [
+            {
+                "user_id": user_id,
+                "channel_id": channel_id,
+                "content": template.format(suffixes[i * SUFFIX_LENGTH:(i + 1) * SUFFIX_LENGTH]),
+            }
+            for i, (user_id, channel_id, template) in enumerate(zip(user_ids, channel_ids, templates))
+        ]
 
     async def send_message(
         self,
         client: httpx.AsyncClient,
-        message: Dict,
-        index: int,
+        payload: bytes,
     ) -> Tuple[bool, str]:
         """
-        Send a single message to the API.
+        Send a single pre-serialized message to the API.
 
         Returns:
             Tuple of (success: bool, error_message: str)
@@ -87,8 +106,38 @@ class LoadTester:
         try:
             response = await client.post(
                 f"{self.api_url}/messages",
-                json=message,
-                timeout=10.0,
+                content=payload,
+                headers=JSON_HEADERS,
+            )
+
+            if response.status_code == 201:
+                return (True, "")
+            else:
+                return (False, f"HTTP {response.status_code}: {response.text[:100]}")
+
+        except httpx.TimeoutException:
+            return (False, "Request timeout")
+        except httpx.ConnectError:
+            return (False, "Connection failed - is the API running?")
+        except Exception as e:
+            return (False, f"Exception: {str(e)[:100]}")
+
+    async def send_batch(
+        self,
+        client: httpx.AsyncClient,
+        payload: bytes,
+    ) -> Tuple[bool, str]:
+        """
+        Send several pre-serialized messages in one request to the bulk endpoint.
+
+        Returns:
+            Tuple of (success: bool, error_message: str)
+        """
+        try:
+            response = await client.post(
+                f"{self.api_url}/messages/bulk",
+                content=payload,
+                headers=JSON_HEADERS,
             )
 
             if response.status_code == 201:
@@ -131,13 +180,14 @@ class LoadTester:
         print(f"API URL:              {self.api_url}")
         print(f"Total Messages:       {self.total_messages:,}")
         print(f"Concurrent Requests:  {self.concurrent_requests}")
+        print(f"Messages per Request: {self.batch_per_request}")
         print(f"Start Time:           {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 80)
 
-        # Check API health
-        print("\n🔍 Checking API health...")
-        try:
-            async with httpx.AsyncClient() as client:
+        async with self.create_client() as client:
+            # Check API health
+            print("\n🔍 Checking API health...")
+            try:
                 response = await client.get(f"{self.api_url}/health", timeout=5.0)
                 if response.status_code == 200:
                     health_data = response.json()
@@ -146,41 +196,76 @@ class LoadTester:
                     print(f"  Queue Length: {health_data.get('queue_length', 'unknown')}")
                 else:
                     print(f"⚠ API returned status {response.status_code}")
-        except Exception as e:
-            print(f"✗ Failed to connect to API: {e}")
-            print("  Make sure the backend is running at http://localhost:8000")
-            return
-
-        print("\n🚀 Starting load test...\n")
-
-        # Generate all messages upfront
-        messages = [self.generate_message() for _ in range(self.total_messages)]
-
-        self.start_time = time.time()
-        semaphore = asyncio.Semaphore(self.concurrent_requests)
-
-        async def send_with_semaphore(client, msg, idx):
-            async with semaphore:
-                success, error = await self.send_message(client, msg, idx)
-
-                if success:
-                    self.successful_requests += 1
-                else:
-                    self.failed_requests += 1
-                    if len(self.errors) < 10:  # Keep only first 10 errors
-                        self.errors.append(error)
-
-                # Print progress every 100 messages
-                if (idx + 1) % 100 == 0 or idx == 0:
-                    self.print_progress(idx + 1, self.total_messages, self.start_time)
-
-        # Send all messages concurrently with semaphore control
-        async with httpx.AsyncClient() as client:
-            tasks = [
-                send_with_semaphore(client, msg, idx)
-                for idx, msg in enumerate(messages)
-            ]
-            await asyncio.gather(*tasks)
+            except Exception as e:
+                print(f"✗ Failed to connect to API: {e}")
+                print("  Make sure the backend is running at http://localhost:8000")
+                return
+
+            print("\n🚀 Starting load test...\n")
+
+            # Generate and serialize all request bodies upfront, so no JSON
+            # encoding happens on the event loop while the test is timed.
+            # Each job is (body, number of messages in it)
+            messages = self.generate_messages(self.total_messages)
+            k = self.batch_per_request
+            if k > 1:
+                # Group messages into one request each for the bulk endpoint
+                jobs = []
+                for i in range(0, len(messages), k):
+                    chunk = messages[i:i + k]
+                    jobs.append((orjson.dumps({"messages": chunk}), len(chunk)))
+            else:
+                jobs = [(orjson.dumps(message), 1) for message in messages]
+
+            async def send(payload: bytes) -> Tuple[bool, str]:
+                if k > 1:
+                    return await self.send_batch(client, payload)
+                return await self.send_message(client, payload)
+
+            # A fixed pool of concurrent_requests workers pulls jobs from a small
+            # bounded queue, so only that many request coroutines ever exist
+            # (instead of one task per message all waiting on a semaphore)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrent_requests * 2)
+
+            async def worker():
+                while True:
+                    payload, size = await queue.get()
+                    try:
+                        success, error = await send(payload)
+
+                        # Counters stay in messages so results compare across batch sizes
+                        if success:
+                            self.successful_requests += size
+                        else:
+                            self.failed_requests += size
+                            if len(self.errors) < 10:  # Keep only first 10 errors
+                                self.errors.append(error)
+
+                    finally:
+                        queue.task_done()
+
+            # Workers only bump counters; one task redraws the progress bar on a
+            # timer, keeping stdout writes off the request path
+            async def report_progress():
+                while True:
+                    await asyncio.sleep(PROGRESS_INTERVAL_SECONDS)
+                    self.print_progress(
+                        self.successful_requests + self.failed_requests, self.total_messages, self.start_time
+                    )
+
+            self.start_time = time.time()
+
+            # Reuse the health check's client and its warm connections
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrent_requests)]
+            reporter = asyncio.create_task(report_progress())
+            try:
+                for job in jobs:
+                    await queue.put(job)
+                await queue.join()
+            finally:
+                for task in (*workers, reporter):
+                    task.cancel()
+                await asyncio.gather(*workers, reporter, return_exceptions=True)
 
         self.end_time = time.time()
 
@@ -262,6 +347,12 @@ async def main():
         action="store_true",
         help="Extreme test mode (50000 messages, 500 concurrent)"
     )
+    parser.add_argument(
+        "--batch-per-request",
+        type=int,
+        default=1,
+        help=f"Messages per request; above 1 uses POST /messages/bulk (default: 1, max: {MAX_BULK_MESSAGES})"
+    )
 
     args = parser.parse_args()
 
@@ -283,6 +374,7 @@ async def main():
         api_url=args.url,
         total_messages=messages,
         concurrent_requests=concurrent,
+        batch_per_request=max(1, min(args.batch_per_request, MAX_BULK_MESSAGES)),
     )
 
     try:
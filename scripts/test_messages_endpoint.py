@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 """
 Test script to verify GET /messages endpoint works correctly
+
+The database check uses asyncpg: results arrive over the binary protocol as
+native ints/datetimes, and statements are prepared once per pooled connection.
 """
 import sys
 sys.path.insert(0, '../backend')
 
-import psycopg2
+import asyncio
+import io
 import os
+from typing import Optional, TextIO
+from urllib.parse import quote
+
+import asyncpg
+import httpx
+import orjson
 
 # Database connection settings
 DB_HOST = os.getenv("DB_HOST", "localhost")
@@ -14,89 +24,249 @@ DB_PORT = int(os.getenv("DB_PORT", 5432))
 DB_NAME = os.getenv("DB_NAME", "messages_db")
 DB_USER = os.getenv("DB_USER", "ingestor")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "ingestor_pass")
+# Assembled once at import; user and password are quoted for the URL
+DSN = f"postgresql://{quote(DB_USER, safe='')}:{quote(DB_PASSWORD, safe='')}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# API settings: GET /messages?limit=1 is the main check (one message is enough to
+# show the endpoint works); the rest only need to answer 200 and are not parsed
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+API_CHECKS = ("/messages?limit=1", "/health", "/messages?limit=100")
+
+# Below this many rows an exact COUNT(*) is cheap; above it, use the planner estimate
+EXACT_COUNT_THRESHOLD = 100_000
+PREVIEW_LIMIT = int(os.getenv("PREVIEW_LIMIT", 5))  # Messages shown by the database check
+
+# Larger previews are streamed through a server-side cursor in STREAM_PREFETCH
+# row pages instead of being aggregated into one value
+STREAM_THRESHOLD = 1000
+STREAM_PREFETCH = 1000
+
+# When set, the last PREVIEW_LIMIT messages are also written to this file in
+# PostgreSQL's binary COPY format (for bulk inspection or loading elsewhere)
+DUMP_PATH = os.getenv("DUMP_PATH")
+
+# Count and preview in one statement (one round trip). pg_class.reltuples is a
+# catalog lookup instead of a full scan; it is -1 until the table is first
+# analyzed, which also takes the exact COUNT(*) branch. The COUNT(*) subquery
+# only runs when the CASE reaches it. Threshold and limit are parameters, so the
+# text is constant and the prepared plan is reused
+SNAPSHOT_SQL = """
+    WITH estimate AS (
+        SELECT reltuples::bigint AS n FROM pg_class WHERE oid = 'messages'::regclass
+    ),
+    recent AS (
+        -- Only the 50 characters that get printed leave the server
+        SELECT id, user_id, channel_id, substr(content, 1, 50) AS content_preview, created_at, inserted_at
+        FROM messages
+        ORDER BY inserted_at DESC
+        LIMIT $2
+    )
+    SELECT
+        CASE WHEN estimate.n >= $1 THEN estimate.n
+             ELSE (SELECT COUNT(*) FROM messages)
+        END AS total_count,
+        estimate.n >= $1 AS is_estimate,
+        (SELECT COALESCE(json_agg(recent ORDER BY recent.inserted_at DESC), '[]') FROM recent) AS recent
+    FROM estimate
+"""
+
+# Same columns as the snapshot preview, for the streaming path
+RECENT_SQL = """
+    SELECT id, user_id, channel_id, substr(content, 1, 50) AS content_preview, created_at, inserted_at
+    FROM messages
+    ORDER BY inserted_at DESC
+    LIMIT $1
+"""
+
+# Created on first use and reused by every check, so repeated runs (e.g. when
+# called as a periodic probe) skip the TCP + auth handshake
+_POOL: Optional[asyncpg.Pool] = None
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the shared connection pool, creating it on first use"""
+    global _POOL
+    if _POOL is None:
+        _POOL = await asyncpg.create_pool(
+            DSN,
+            min_size=1,
+            max_size=4,
+            timeout=5,
+            # Bound every check query server-side instead of letting a slow
+            # scan hang the script
+            server_settings={"statement_timeout": "2s"}
+        )
+    return _POOL
+
+async def close_pool():
+    """Close the shared pool if it was created"""
+    global _POOL
+    if _POOL is not None:
+        await _POOL.close()
+        _POOL = None
+
+# Same idea for HTTP: one keep-alive client shared by every API check
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared API client, creating it on first use"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        _HTTP_CLIENT = httpx.AsyncClient(base_url=API_URL, timeout=5)
+    return _HTTP_CLIENT
+
+async def close_http_client():
+    """Close the shared API client if it was created"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+async def fetch_database_snapshot(limit: int = PREVIEW_LIMIT):
+    """
+    Return (total message count, whether the count is an estimate, last `limit` messages)
+    using a pooled asyncpg connection
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        # fetchrow() prepares through the connection's statement cache: the
+        # first call parses and plans, later calls on the pooled connection
+        # only bind and execute
+        snapshot = await conn.fetchrow(SNAPSHOT_SQL, EXACT_COUNT_THRESHOLD, limit)
+    return snapshot["total_count"], snapshot["is_estimate"], orjson.loads(snapshot["recent"])
+
+async def stream_recent_messages(limit: int):
+    """
+    Yield the last `limit` messages through a server-side cursor, so memory
+    stays at one STREAM_PREFETCH page however large the limit is
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        # asyncpg cursors only exist inside a transaction
+        async with conn.transaction():
+            async for row in conn.cursor(RECENT_SQL, limit, prefetch=STREAM_PREFETCH):
+                yield row
 
-def test_database_connection():
+SEPARATOR = "-" * 80 + "\n"
+
+async def dump_recent_messages(path: str, limit: int) -> str:
+    """
+    Write the last `limit` messages to `path` with COPY ... TO STDOUT (FORMAT binary).
+    COPY streams rows in compact binary framing straight into the file, without
+    building a Python object per row. Returns the server's status (e.g. "COPY 10000")
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            # A bulk dump can legitimately outlast the 2s check timeout
+            await conn.execute("SET LOCAL statement_timeout = 0")
+            return await conn.copy_from_query(RECENT_SQL, limit, output=path, format="binary")
+
+def format_message_row(row) -> str:
+    """Format one preview row (a snapshot dict or an asyncpg Record)"""
+    return (
+        f"ID: {row['id']} | User: {row['user_id']} | Channel: {row['channel_id']}\n"
+        f"Content: {row['content_preview']}...\n"
+        f"Created: {row['created_at']} | Inserted: {row['inserted_at']}\n"
+        f"{SEPARATOR}"
+    )
+
+async def test_database_connection():
     """Test if we can connect to PostgreSQL and query messages"""
     try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            dbname=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            connect_timeout=5
-        )
+        streaming = PREVIEW_LIMIT > STREAM_THRESHOLD
+        # When streaming, the snapshot only supplies the count
+        total_count, is_estimate, rows = await fetch_database_snapshot(0 if streaming else PREVIEW_LIMIT)
+
+        # Output is assembled and written in one call rather than four print()s
+        # per row; a streamed preview is written once per prefetch page
+        out = [
+            f"✅ Total messages in database: {'≈' if is_estimate else ''}{total_count}\n",
+            f"\n📨 Last {PREVIEW_LIMIT} messages:\n",
+            SEPARATOR,
+        ]
+        if streaming:
+            async for row in stream_recent_messages(PREVIEW_LIMIT):
+                out.append(format_message_row(row))
+                if len(out) >= STREAM_PREFETCH:
+                    sys.stdout.write("".join(out))
+                    out.clear()
+        else:
+            out.extend(format_message_row(row) for row in rows)
+
+        if DUMP_PATH:
+            copy_status = await dump_recent_messages(DUMP_PATH, PREVIEW_LIMIT)
+            out.append(f"\n💾 Binary dump written to {DUMP_PATH} ({copy_status})\n")
+        sys.stdout.write("".join(out))
 
-        with conn.cursor() as cursor:
-            # Check total message count
-            cursor.execute("SELECT COUNT(*) FROM messages")
-            total_count = cursor.fetchone()[0]
-            print(f"✅ Total messages in database: {total_count}")
-
-            # Get last 5 messages
-            cursor.execute("""
-                SELECT id, user_id, channel_id, content, created_at, inserted_at
-                FROM messages
-                ORDER BY inserted_at DESC
-                LIMIT 5
-            """)
-
-            rows = cursor.fetchall()
-            print(f"\n📨 Last 5 messages:")
-            print("-" * 80)
-            for row in rows:
-                print(f"ID: {row[0]} | User: {row[1]} | Channel: {row[2]}")
-                print(f"Content: {row[3][:50]}...")
-                print(f"Created: {row[4]} | Inserted: {row[5]}")
-                print("-" * 80)
-
-        conn.close()
         return True
 
-    except Exception as e:
+    # Server-side errors, driver/protocol errors, unreachable host or dump file
+    # problems, and connect timeouts
+    except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError, asyncio.TimeoutError) as e:
         print(f"❌ Database connection failed: {e}")
         return False
 
-def test_api_endpoint():
-    """Test the GET /messages API endpoint"""
-    import requests
-
+async def test_api_endpoint(out: TextIO = sys.stdout):
+    """Test the GET /messages API endpoint (plus the other read endpoints), reporting to `out`"""
     try:
-        response = requests.get("http://localhost:8000/messages?limit=5", timeout=5)
+        # The checks are independent, so they overlap on the shared client
+        client = get_http_client()
+        responses = await asyncio.gather(*(client.get(path) for path in API_CHECKS))
 
-        if response.status_code == 200:
-            messages = response.json()
-            print(f"\n✅ API endpoint working! Returned {len(messages)} messages")
+        failed = [(path, r) for path, r in zip(API_CHECKS, responses) if r.status_code != 200]
+        if failed:
+            for path, response in failed:
+                print(f"❌ API returned status {response.status_code} for {path}: {response.text}", file=out)
+            return False
 
-            if messages:
-                print("\n📨 First message from API:")
-                print(messages[0])
-            else:
-                print("⚠️  API returned empty array - database might be empty")
+        messages = orjson.loads(responses[0].content)
+        print(f"\n✅ API endpoint working! Returned {len(messages)} messages", file=out)
+        print(f"   Also OK: {', '.join(API_CHECKS[1:])}", file=out)
 
-            return True
+        if messages:
+            print("\n📨 First message from API:", file=out)
+            print(messages[0], file=out)
         else:
-            print(f"❌ API returned status {response.status_code}: {response.text}")
-            return False
+            print("⚠️  API returned empty array - database might be empty", file=out)
 
-    except requests.exceptions.ConnectionError:
-        print("❌ Cannot connect to API at http://localhost:8000")
-        print("   Make sure backend is running: cd infrastructure && docker-compose up")
+        return True
+
+    except httpx.ConnectError:
+        print(f"❌ Cannot connect to API at {API_URL}", file=out)
+        print("   Make sure backend is running: cd infrastructure && docker-compose up", file=out)
         return False
-    except Exception as e:
-        print(f"❌ API test failed: {e}")
+    # Transport/protocol errors, or a 200 whose body is not JSON
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+        print(f"❌ API test failed: {e}", file=out)
         return False
 
+async def main():
+    """
+    Run both checks concurrently; the pool and HTTP client live for the whole
+    run and are closed at the end. The database check writes as it goes, the API check
+    reports into a buffer printed afterwards, so the output never interleaves
+    """
+    api_out = io.StringIO()
+    try:
+        print("\n1. Testing Database Connection...")
+        db_ok, api_ok = await asyncio.gather(
+            test_database_connection(),
+            test_api_endpoint(api_out),
+        )
+    finally:
+        await close_pool()
+        await close_http_client()
+
+    print("\n2. Testing API Endpoint...")
+    sys.stdout.write(api_out.getvalue())
+    return db_ok, api_ok
+
 if __name__ == "__main__":
     print("=" * 80)
     print("TESTING MESSAGE RETRIEVAL")
     print("=" * 80)
 
-    print("\n1. Testing Database Connection...")
-    db_ok = test_database_connection()
-
-    print("\n2. Testing API Endpoint...")
-    api_ok = test_api_endpoint()
+    db_ok, api_ok = asyncio.run(main())
 
     print("\n" + "=" * 80)
     if db_ok and api_ok: